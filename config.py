@@ -25,4 +25,8 @@ class Config:
     TARGET2_A = opt_env("TARGET2_A")
     TARGET2_LIST = opt_env("TARGET2_LIST")
 
-    DELAY_SECONDS = float(opt_env("DELAY_SECONDS", "0.4"))
+    # Max copy_message calls per second (Telegram allows ~30 msg/s overall)
+    COPY_RATE = float(opt_env("COPY_RATE", "20"))
+
+    # Where target indexes are persisted between runs ("" disables caching)
+    INDEX_CACHE_DIR = opt_env("INDEX_CACHE_DIR", os.path.expanduser("~/.gitalistmaker"))
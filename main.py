@@ -1,24 +1,42 @@
 import asyncio
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import random
 import re
+import sys
+import time
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Tuple, Union
 
-from pyrogram import Client, filters
-from pyrogram.errors import FloodWait
+from pyrogram import Client, filters, raw
+from pyrogram.errors import FloodWait, InternalServerError, RPCError
 from pyrogram.types import Message
 
 from config import Config
 
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:  # e.g. Windows — stock asyncio loop works fine
+    uvloop = None
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 log = logging.getLogger("multi-list-maker")
 
 # Link formats:
 # - https://t.me/username/123
 # - https://t.me/c/123456789/123
-LINK_RE = re.compile(r"(?:https?://)?t\.me/(c/)?([^/\s]+)/(\d+)", re.IGNORECASE)
+# re.ASCII: links are pure ASCII and ASCII-mode \s/\d are cheaper per
+# character than the Unicode default.
+LINK_RE = re.compile(r"(?:https?://)?t\.me/(c/)?([^/\s]+)/(\d+)", re.IGNORECASE | re.ASCII)
 
-# Remove URLs inside caption:
+# Remove URLs inside caption. Unicode mode on purpose: ASCII \S would run
+# through Unicode whitespace (e.g. \xa0) and delete the words after a URL.
 URL_IN_TEXT_RE = re.compile(r"(https?://\S+|t\.me/\S+|telegram\.(me|dog)/\S+)", re.IGNORECASE)
 
 ChatRef = Union[int, str]  # -100... or username
@@ -47,26 +65,57 @@ def parse_tme_link(link: str) -> Tuple[ChatRef, int]:
     return chat_part, msg_id  # username, msg_id
 
 
-async def resolve_chat_id(app: Client, chat_ref: ChatRef) -> int:
-    if isinstance(chat_ref, int):
-        return chat_ref
+# (chat_id, username) per resolved ref; both resolve_* helpers share it so
+# the same chat costs one get_chat per process instead of one per call.
+_CHAT_CACHE: Dict[ChatRef, Tuple[int, Optional[str]]] = {}
+
+
+async def _resolve_chat(app: Client, chat_ref: ChatRef) -> Tuple[int, Optional[str]]:
+    cached = _CHAT_CACHE.get(chat_ref)
+    if cached:
+        return cached
     chat = await app.get_chat(chat_ref)
-    return chat.id
+    info = (chat.id, chat.username)
+    _CHAT_CACHE[chat_ref] = info
+    _CHAT_CACHE[chat.id] = info  # id lookups hit the same entry
+    return info
+
+
+async def resolve_chat_id(app: Client, chat_ref: ChatRef) -> int:
+    return (await _resolve_chat(app, chat_ref))[0]
 
 
 async def resolve_username(app: Client, chat_id: int) -> Optional[str]:
-    chat = await app.get_chat(chat_id)
-    return chat.username
+    return (await _resolve_chat(app, chat_id))[1]
 
 
+@functools.lru_cache(maxsize=65536)
 def clean_caption(text: str) -> str:
-    """Remove URLs, normalize whitespace, case-insensitive."""
+    """Remove URLs, normalize whitespace, case-insensitive.
+
+    Cached: boilerplate captions repeat a lot across a range, so identical
+    inputs skip the regex work entirely. Captions without links take a
+    split/join fast path that never touches the regex engine.
+    """
     if not text:
         return ""
-    t = text.strip()
-    t = URL_IN_TEXT_RE.sub("", t)
-    t = re.sub(r"\s+", " ", t).strip()
-    return t.casefold()
+    # Guard against the casefolded copy: URL_IN_TEXT_RE is IGNORECASE, so
+    # "HTTPS://..." must not slip past the fast path.
+    low = text.casefold()
+    if "http" not in low and "t.me" not in low and "telegram." not in low:
+        return " ".join(low.split())
+    t = URL_IN_TEXT_RE.sub("", text)
+    # split()/join() collapse all (Unicode) whitespace in C, no regex needed
+    return " ".join(t.split()).casefold()
+
+
+def caption_digest(cleaned: str) -> int:
+    """64-bit digest of a cleaned caption — the index key.
+
+    An int key is ~8 bytes vs 80+ for a str and skips per-lookup string
+    hashing. Collision odds at a million captions are ~1e-7.
+    """
+    return int.from_bytes(hashlib.blake2b(cleaned.encode("utf-8"), digest_size=8).digest(), "little")
 
 
 def make_post_link(chat_username: Optional[str], chat_id: int, msg_id: int) -> str:
@@ -78,41 +127,299 @@ def make_post_link(chat_username: Optional[str], chat_id: int, msg_id: int) -> s
 
 
 async def iter_range(app: Client, chat_id: int, start_id: int, end_id: int, chunk: int = 200):
+    """
+    Yield existing messages in [start_id, end_id], fetching in chunks.
+
+    200 IDs per call is Telegram's cap for messages.getMessages; Pyrogram
+    splits anything larger back into 200-ID requests, so a bigger chunk
+    would not save round trips.
+
+    Chunks are prefetched by a background producer so the next get_messages
+    is already in flight while the consumer works through the current batch.
+    """
+    lo, hi = min(start_id, end_id), max(start_id, end_id)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+    async def _producer():
+        try:
+            for base in range(lo, hi + 1, chunk):
+                ids = list(range(base, min(base + chunk, hi + 1)))
+                await queue.put(await app.get_messages(chat_id, ids))
+            await queue.put(None)  # sentinel: range exhausted
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)  # hand the error to the consumer
+
+    producer = asyncio.create_task(_producer())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            for m in item:
+                if m and not m.empty:
+                    yield m
+    finally:
+        producer.cancel()
+
+
+async def iter_photos(app: Client, chat_id: int, start_id: int, end_id: int):
+    """
+    Yield photo messages in [start_id, end_id], filtered server-side.
+
+    Raw messages.search with the photos filter plus min_id/max_id, so the
+    server only ever looks inside the requested window — Pyrogram's
+    search_messages wrapper exposes no id bounds and would walk every
+    photo down from the channel top. Results come newest first, 100 per
+    round trip. Falls back to iter_range + client-side check if search is
+    unavailable for the chat.
+    """
     lo, hi = min(start_id, end_id), max(start_id, end_id)
-    for base in range(lo, hi + 1, chunk):
-        ids = list(range(base, min(base + chunk, hi + 1)))
-        msgs = await app.get_messages(chat_id, ids)
-        for m in msgs:
-            if m and not m.empty:
-                yield m
+    yielded = False
+    try:
+        peer = await app.resolve_peer(chat_id)
+        offset_id = 0
+        while True:
+            r = await app.invoke(raw.functions.messages.Search(
+                peer=peer,
+                q="",
+                filter=raw.types.InputMessagesFilterPhotos(),
+                min_date=0,
+                max_date=0,
+                offset_id=offset_id,
+                add_offset=0,
+                limit=100,
+                max_id=hi + 1,  # exclusive bounds server-side
+                min_id=lo - 1,
+                hash=0,
+            ))
+            if not r.messages:
+                return
+            users = {u.id: u for u in r.users}
+            chats = {c.id: c for c in r.chats}
+            for raw_msg in r.messages:
+                m = await Message._parse(app, raw_msg, users, chats, replies=0)
+                if m and not m.empty:
+                    yielded = True
+                    yield m
+            offset_id = r.messages[-1].id
+    except Exception as e:
+        if yielded:
+            raise  # mid-stream failure: don't restart and duplicate messages
+        log.warning(f"messages.search failed for {chat_id} ({e}) — falling back to id-range fetch")
+    async for m in iter_range(app, chat_id, lo, hi):
+        if m.photo:
+            yield m
+
+
+def _digest_batch(captions: list) -> list:
+    """Clean + digest a batch of raw captions (0 for captions that clean to empty).
+
+    Plain function so build_index_for_target can run it in a thread via
+    run_in_executor, keeping regex/hash work off the event loop.
+    """
+    out = []
+    for text in captions:
+        key = clean_caption(text)
+        out.append(caption_digest(key) if key else 0)
+    return out
+
+
+def _index_cache_path(chat_a: int, lo: int, hi: int) -> Optional[str]:
+    """File the (chat, range) index persists to, or None if caching is off."""
+    if not Config.INDEX_CACHE_DIR:
+        return None
+    return os.path.join(Config.INDEX_CACHE_DIR, f"index_{chat_a}_{lo}_{hi}.pkl")
+
+
+def _load_index_cache(path: str) -> Optional[Tuple[Dict[int, Tuple[int, str]], int]]:
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning(f"Ignoring unreadable index cache {path}: {e}")
+        return None
 
 
-async def build_index_for_target(app: Client, chat_a: int, start_a: int, end_a: int) -> Dict[str, int]:
+def _save_index_cache(path: str, index: Dict[int, Tuple[int, str]], last_id: int):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((dict(index), last_id), f)
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning(f"Could not persist index cache {path}: {e}")
+
+
+async def build_index_for_target(
+    app: Client, chat_a: int, start_a: int, end_a: int,
+    into: Optional[Dict[int, Tuple[int, str]]] = None,
+) -> Dict[int, Tuple[int, str]]:
     """
     Index ONLY photos in target channel range:
-      cleaned_caption -> FIRST message_id
+      caption_digest(cleaned_caption) -> (FIRST message_id, stripped caption)
+
+    Caching the caption alongside the id lets /run copy a match directly
+    without re-fetching the A message (one saved RPC per match).
+
+    Captions are cleaned in batches of 200 on the default executor so the
+    event loop stays free for concurrent I/O (prefetch, copies).
+
+    The finished index is persisted under INDEX_CACHE_DIR keyed on
+    (chat, range); a later run over the same range loads it and only
+    fetches message ids past the last indexed one. Entries whose A
+    message was deleted since the cache was written fail their copy and
+    count as not-found; delete the cache file to pick up edits.
+
+    Pass `into` to populate an existing dict in place, which lets callers
+    start matching against the index while it is still being built.
     """
-    index: Dict[str, int] = {}
-    async for m in iter_range(app, chat_a, start_a, end_a):
-        if not m.photo:
-            continue
-        key = clean_caption(m.caption or "")
-        if key and key not in index:
-            index[key] = m.id
+    index: Dict[int, Tuple[int, str]] = {} if into is None else into
+    lo, hi = min(start_a, end_a), max(start_a, end_a)
+
+    cache_path = _index_cache_path(chat_a, lo, hi)
+    fetch_from = lo
+    if cache_path:
+        cached = _load_index_cache(cache_path)
+        if cached:
+            cached_index, last_id = cached
+            index.update(cached_index)
+            fetch_from = last_id + 1
+            log.info(f"Loaded {len(cached_index)} cached index entries for {chat_a}; "
+                     f"resuming from id {fetch_from}")
+    if fetch_from > hi:
+        return index
+
+    loop = asyncio.get_running_loop()
+    batch: list = []  # (msg_id, raw_caption)
+
+    async def _flush():
+        digs = await loop.run_in_executor(None, _digest_batch, [c for _, c in batch])
+        for (mid, raw_caption), dig in zip(batch, digs):
+            if not dig:
+                continue
+            prev = index.get(dig)
+            # iter_photos yields newest first, so "first message" means the
+            # SMALLEST id on a duplicate caption, not the first one seen.
+            if prev is None or mid < prev[0]:
+                # Stored pre-stripped so matches concatenate without cleanup.
+                # Intern the cached caption: repeated boilerplate across large
+                # ranges then shares one string object instead of one per entry.
+                index[dig] = (mid, sys.intern(raw_caption.strip()))
+        batch.clear()
+
+    async for m in iter_photos(app, chat_a, fetch_from, hi):
+        batch.append((m.id, m.caption or ""))
+        if len(batch) >= 200:
+            await _flush()
+    if batch:
+        await _flush()
+
+    if cache_path:
+        _save_index_cache(cache_path, index, hi)
     return index
 
 
-async def safe_copy(app: Client, from_chat: int, msg_id: int, to_chat: ChatRef, caption: str):
-    try:
-        await app.copy_message(to_chat, from_chat, msg_id, caption=caption)
-    except FloodWait as e:
-        log.warning(f"FloodWait {e.value}s — sleeping...")
-        await asyncio.sleep(e.value)
-        await app.copy_message(to_chat, from_chat, msg_id, caption=caption)
+class FrozenIndex:
+    """
+    Read-only form of a caption index: digests sorted in a contiguous
+    uint64 array with message ids and captions in aligned arrays.
+
+    Same get() contract as the build-time dict, but lookups bisect packed
+    8-byte integers instead of probing a dict of boxed ints — fewer cache
+    misses per lookup once the index stops changing.
+    """
+
+    __slots__ = ("_digests", "_ids", "_captions")
+
+    def __init__(self, index: Dict[int, Tuple[int, str]]):
+        items = sorted(index.items())
+        self._digests = array("Q", (dig for dig, _ in items))
+        self._ids = array("q", (mid for _, (mid, _) in items))
+        self._captions = [cap for _, (_, cap) in items]
+
+    def __len__(self) -> int:
+        return len(self._digests)
 
+    def get(self, dig: int, default=None):
+        i = bisect_left(self._digests, dig)
+        if i < len(self._digests) and self._digests[i] == dig:
+            return self._ids[i], self._captions[i]
+        return default
 
-def owner_only(_, __, m: Message) -> bool:
-    return bool(m.from_user and m.from_user.id == Config.OWNER_ID)
+
+class TokenBucket:
+    """
+    Asyncio token bucket: refills at `rate` tokens/second, bursts up to `burst`.
+
+    Unlike a fixed per-message sleep, callers only wait when they are actually
+    ahead of the allowed rate. `penalize()` empties the bucket and blocks all
+    callers for a while — used when Telegram answers with a FloodWait.
+    """
+
+    def __init__(self, rate: float, burst: int = 5):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def penalize(self, seconds: float):
+        self._tokens = 0.0
+        self._blocked_until = time.monotonic() + seconds
+
+
+COPY_LIMITER = TokenBucket(Config.COPY_RATE)
+
+
+async def safe_copy(app: Client, from_chat: int, msg_id: int, to_chat: ChatRef, caption: str,
+                    max_attempts: int = 5):
+    """
+    copy_message with retries: FloodWait sleeps the server-given interval,
+    transient server/network errors back off exponentially with jitter.
+    Permanent errors (bad message id, no write access, ...) re-raise
+    immediately; transient ones re-raise after `max_attempts` so the
+    message isn't silently lost.
+    """
+    for attempt in range(max_attempts):
+        await COPY_LIMITER.acquire()
+        try:
+            return await app.copy_message(to_chat, from_chat, msg_id, caption=caption)
+        except FloodWait as e:
+            log.warning(f"FloodWait {e.value}s on copy of {msg_id} — draining limiter...")
+            COPY_LIMITER.penalize(e.value)
+            await asyncio.sleep(e.value + random.uniform(0, 0.5))
+        except (InternalServerError, OSError) as e:
+            # Telegram 5xx or network blip — worth retrying. OSError covers
+            # socket/Connection/Timeout errors. Anything else propagates.
+            if attempt == max_attempts - 1:
+                log.error(f"copy of {msg_id} failed after {max_attempts} attempts: {e}")
+                raise
+            delay = min(30, 2 ** attempt) + random.random()
+            log.warning(f"copy of {msg_id} failed ({e}) — retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+    raise RuntimeError(f"copy of {msg_id} exhausted {max_attempts} FloodWait retries")
 
 
 @dataclass
@@ -151,6 +458,11 @@ if Config.TARGET2_LIST:
     STATE.targets[2].target_list = normalize_chat_ref(Config.TARGET2_LIST)
 
 
+# Built-in user filter: Pyrogram matches against a set of ids natively
+# instead of calling a Python callback for every incoming message.
+OWNER_FILTER = filters.user(Config.OWNER_ID)
+
+
 app = Client(
     "multi_list_userbot",
     api_id=Config.API_ID,
@@ -170,7 +482,7 @@ def target_summary() -> str:
     return "\n".join(lines)
 
 
-@app.on_message(filters.command("start") & filters.create(owner_only))
+@app.on_message(filters.command("start") & OWNER_FILTER)
 async def cmd_start(_, message: Message):
     missing = []
     if not STATE.source_x:
@@ -207,7 +519,7 @@ async def cmd_start(_, message: Message):
         await message.reply(help_text + "\n✅ All channels are set. Now set ranges and run.")
 
 
-@app.on_message(filters.command("setsourcelist") & filters.create(owner_only))
+@app.on_message(filters.command("setsourcelist") & OWNER_FILTER)
 async def cmd_setsourcelist(_, message: Message):
     if len(message.command) < 2:
         return await message.reply("Usage: `/setsourcelist <username_or_-100id>`")
@@ -215,7 +527,7 @@ async def cmd_setsourcelist(_, message: Message):
     await message.reply("✅ Source X set.")
 
 
-@app.on_message(filters.command("settarget") & filters.create(owner_only))
+@app.on_message(filters.command("settarget") & OWNER_FILTER)
 async def cmd_settarget(_, message: Message):
     if len(message.command) < 3:
         return await message.reply("Usage: `/settarget <n> <username_or_-100id>`")
@@ -226,7 +538,7 @@ async def cmd_settarget(_, message: Message):
     await message.reply(f"✅ Target {n} A set.")
 
 
-@app.on_message(filters.command("setlist") & filters.create(owner_only))
+@app.on_message(filters.command("setlist") & OWNER_FILTER)
 async def cmd_setlist(_, message: Message):
     if len(message.command) < 3:
         return await message.reply("Usage: `/setlist <n> <username_or_-100id>`")
@@ -237,7 +549,7 @@ async def cmd_setlist(_, message: Message):
     await message.reply(f"✅ Target {n} LIST set.")
 
 
-@app.on_message(filters.command("setxrange") & filters.create(owner_only))
+@app.on_message(filters.command("setxrange") & OWNER_FILTER)
 async def cmd_setxrange(_, message: Message):
     if not STATE.source_x:
         return await message.reply("❌ Set Source X first: `/setsourcelist ...`")
@@ -246,7 +558,7 @@ async def cmd_setxrange(_, message: Message):
     await message.reply("Send **Source X FIRST post link** now.")
 
 
-@app.on_message(filters.command("setarange") & filters.create(owner_only))
+@app.on_message(filters.command("setarange") & OWNER_FILTER)
 async def cmd_setarange(_, message: Message):
     if len(message.command) < 2:
         return await message.reply("Usage: `/setarange <n>`")
@@ -261,7 +573,7 @@ async def cmd_setarange(_, message: Message):
     await message.reply(f"Send **Target {n} A FIRST post link** now.")
 
 
-@app.on_message(filters.command("status") & filters.create(owner_only))
+@app.on_message(filters.command("status") & OWNER_FILTER)
 async def cmd_status(_, message: Message):
     await message.reply(
         f"**Source X:** `{STATE.source_x}`\n"
@@ -270,14 +582,15 @@ async def cmd_status(_, message: Message):
     )
 
 
-@app.on_message(filters.command("reset") & filters.create(owner_only))
+@app.on_message(filters.command("reset") & OWNER_FILTER)
 async def cmd_reset(_, message: Message):
     global STATE
     STATE = State()
+    _CHAT_CACHE.clear()
     await message.reply("✅ Reset done. Use `/start` again.")
 
 
-@app.on_message(filters.text & filters.create(owner_only))
+@app.on_message(filters.text & OWNER_FILTER)
 async def handle_text(_, message: Message):
     if not STATE.waiting_for:
         return
@@ -308,7 +621,7 @@ async def handle_text(_, message: Message):
         return await message.reply(f"✅ Target {n} range set.\nWhen ready, run `/run`.")
 
 
-@app.on_message(filters.command("run") & filters.create(owner_only))
+@app.on_message(filters.command("run") & OWNER_FILTER)
 async def cmd_run(client: Client, message: Message):
     # Validate
     if not STATE.source_x:
@@ -343,70 +656,137 @@ async def cmd_run(client: Client, message: Message):
     # Resolve chat IDs
     chat_x = await resolve_chat_id(client, STATE.source_x)
 
-    # Build indexes per target
-    progress = await message.reply("⏳ Building indexes for targets (photos only)...")
+    # Build indexes per target, overlapped with X processing
+    progress = await message.reply("⏳ Indexing targets while scanning Source X (photos only)...")
 
-    indexes: Dict[int, Dict[str, int]] = {}
+    # dict while a build is in flight, FrozenIndex once its builder finishes
+    indexes: Dict[int, Union[Dict[int, Tuple[int, str]], FrozenIndex]] = {}
     a_chat_ids: Dict[int, int] = {}
     a_usernames: Dict[int, Optional[str]] = {}
 
-    for n in sorted(STATE.targets.keys()):
-        t = STATE.targets[n]
-        chat_a = await resolve_chat_id(client, t.target_a)  # type: ignore
-        a_chat_ids[n] = chat_a
-        a_usernames[n] = await resolve_username(client, chat_a)
-        a_start_id, a_end_id = target_specs[n]
-
-        idx = await build_index_for_target(client, chat_a, a_start_id, a_end_id)
-        indexes[n] = idx
-        await progress.edit(f"✅ Indexed Target {n}: {len(idx)} captions\n⏳ Building remaining...")
+    # Targets are independent, so build their indexes concurrently instead of
+    # waiting for each to finish. Cap in-flight builds to stay polite with
+    # Pyrogram's connection pool.
+    build_sem = asyncio.Semaphore(4)
 
-    await progress.edit("✅ Indexes ready.\n⏳ Processing Source X photos and forwarding matches...")
+    async def _build_one(n: int):
+        async with build_sem:
+            t = STATE.targets[n]
+            chat_a = await resolve_chat_id(client, t.target_a)  # type: ignore
+            a_chat_ids[n] = chat_a
+            a_usernames[n] = await resolve_username(client, chat_a)
+            a_start_id, a_end_id = target_specs[n]
+            # Register the dict up front and fill it in place, so the X loop
+            # below can already match against the partially-built index.
+            idx: Dict[int, Tuple[int, str]] = {}
+            indexes[n] = idx
+            await build_index_for_target(client, chat_a, a_start_id, a_end_id, into=idx)
+            # Build finished: swap in the packed read-only form for the
+            # remainder of the run.
+            indexes[n] = FrozenIndex(idx)
+
+    builders = asyncio.gather(*[_build_one(n) for n in sorted(STATE.targets.keys())])
 
     processed_x = 0
+    duplicate_x = 0
     total_sent = {1: 0, 2: 0}
     total_not_found = {1: 0, 2: 0}
 
-    async for x_msg in iter_range(client, chat_x, x_start_id, x_end_id):
-        if not x_msg.photo:
-            continue
-        processed_x += 1
-        key = clean_caption(x_msg.caption or "")
-        if not key:
-            continue
+    # Digests already handled this run: repeated X captions would produce
+    # byte-identical copies, so only the first occurrence is dispatched.
+    seen_digs: set = set()
 
-        # For each target pair, try match and send
-        for n in sorted(STATE.targets.keys()):
-            t = STATE.targets[n]
-            idx = indexes[n]
-            a_mid = idx.get(key)
+    # X keys that missed a target while its index was still growing; they get
+    # one re-check against the finished index after the builders complete.
+    pending: Dict[int, list] = {n: [] for n in STATE.targets}
 
-            if not a_mid:
-                total_not_found[n] += 1
-                continue
+    # Copies are fired as tasks so up to 8 copy RPCs overlap; the token
+    # bucket in safe_copy still enforces the send rate.
+    copy_sem = asyncio.Semaphore(8)
+    copy_tasks: list = []
 
+    async def _send_match(n: int, hit: Tuple[int, str]):
+        async with copy_sem:
+            a_mid, a_caption = hit
             chat_a = a_chat_ids[n]
-            a_msg = await client.get_messages(chat_a, a_mid)
-            if not a_msg or a_msg.empty or not a_msg.photo:
+            link = make_post_link(a_usernames[n], chat_a, a_mid)
+            # caption is stored stripped, so no cleanup needed here
+            final_caption = f"{a_caption}\n\n🔗 Link: {link}" if a_caption else f"🔗 Link: {link}"
+            try:
+                await safe_copy(client, chat_a, a_mid, STATE.targets[n].target_list, final_caption)  # type: ignore
+                total_sent[n] += 1
+            except RPCError as e:
+                # e.g. the indexed A message was deleted since the cache was
+                # written — count it like the pre-copy check used to and keep
+                # the run going.
+                log.warning(f"copy of {a_mid} for Target {n} rejected ({e}) — counting as not found")
                 total_not_found[n] += 1
+
+    def _dispatch(n: int, hit: Tuple[int, str]):
+        copy_tasks.append(asyncio.create_task(_send_match(n, hit)))
+
+    try:
+        # Note: iter_photos serves the X range newest first, so matches reach
+        # the LIST channels in roughly reverse post order (exact order was
+        # already relaxed when copies became concurrent tasks).
+        async for x_msg in iter_photos(client, chat_x, x_start_id, x_end_id):
+            processed_x += 1
+            key = clean_caption(x_msg.caption or "")
+            if not key:
+                continue
+            dig = caption_digest(key)
+            if dig in seen_digs:
+                duplicate_x += 1
                 continue
+            seen_digs.add(dig)
 
-            link = make_post_link(a_usernames[n], chat_a, a_mid)
-            a_caption = (a_msg.caption or "").strip()
-            final_caption = (a_caption + f"\n\n🔗 Link: {link}").strip()
+            # For each target pair, try match and send
+            for n in sorted(STATE.targets.keys()):
+                hit = indexes[n].get(dig) if n in indexes else None
+
+                if not hit:
+                    if builders.done():
+                        total_not_found[n] += 1
+                    else:
+                        pending[n].append(dig)
+                    continue
+
+                _dispatch(n, hit)
 
-            await safe_copy(client, chat_a, a_mid, t.target_list, final_caption)  # type: ignore
-            total_sent[n] += 1
+        await builders
+    except Exception:
+        builders.cancel()
+        for task in copy_tasks:
+            task.cancel()
+        raise
+
+    # Second pass: keys that missed mid-build get a final answer now.
+    for n in sorted(STATE.targets.keys()):
+        for dig in pending[n]:
+            hit = indexes[n].get(dig)
+            if not hit:
+                total_not_found[n] += 1
+                continue
+            _dispatch(n, hit)
 
-            await asyncio.sleep(Config.DELAY_SECONDS)
+    # return_exceptions so one failed copy can't kill the gather, orphan the
+    # other in-flight tasks and leave the summary unposted.
+    failed_copies = 0
+    if copy_tasks:
+        for result in await asyncio.gather(*copy_tasks, return_exceptions=True):
+            if isinstance(result, BaseException):
+                failed_copies += 1
+                log.error(f"copy task failed: {result}")
 
     # Summary
     summary = (
         "✅ **DONE!**\n"
-        f"Source X photos processed: {processed_x}\n\n"
+        f"Source X photos processed: {processed_x} (duplicates skipped: {duplicate_x})\n\n"
         f"**Target 1:** sent={total_sent[1]}  no_match={total_not_found[1]}\n"
         f"**Target 2:** sent={total_sent[2]}  no_match={total_not_found[2]}\n"
     )
+    if failed_copies:
+        summary += f"\n⚠️ Failed copies: {failed_copies} (see logs)\n"
     await progress.edit(summary)
 
 